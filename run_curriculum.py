@@ -0,0 +1,96 @@
+# run_curriculum.py
+import os
+import time
+from src.env import make_env
+from src.agent import QAgent
+from src.stats import TrainingStats
+from src.config import LEVELS, CURRICULUM_QTABLE_PATH
+from run_train import run_episode, report_line
+
+
+def level_qpath(key_mode, lvl, transfer=True):
+    tag = key_mode if transfer else f"{key_mode}_cold"
+    return CURRICULUM_QTABLE_PATH.format(tag, lvl)
+
+
+def curriculum_loop(
+    levels=LEVELS,
+    max_episodes=20000,   # 🔹 per level, advance anyway after this many
+    window=200,           # episodes in the win-rate window
+    report_every=500,
+    key_mode="region",    # "region" carries over as is, "cell" is remapped
+    level_eps=0.3,        # exploration restart at each new level
+    transfer=True         # False: every level starts from an empty table
+):
+    """
+    Headless curriculum training.
+    Trains level by level (increasing size / density), keeping the Q-table
+    between levels, and advances once the recent win-rate meets the level's
+    threshold.
+    Each level saves its own table; a rerun resumes at the last saved level,
+    so a larger-board table is never replaced by a copy remapped down.
+    With transfer=False the levels are trained cold (baseline to compare).
+    Returns [(level, passed, episodes, final win-rate)].
+    """
+
+    first = 1
+    if transfer:
+        for lvl in range(len(levels), 0, -1):
+            if os.path.exists(level_qpath(key_mode, lvl)):
+                first = lvl
+                break
+
+    agent = None
+    results = []
+    start_time = time.time()
+
+    for lvl, (rows, cols, mines, threshold) in enumerate(levels, 1):
+        if lvl < first:
+            continue
+        env = make_env(rows=rows, cols=cols, mines=mines)
+        qpath = level_qpath(key_mode, lvl, transfer)
+        if agent is None or not transfer:
+            agent = QAgent(env, qpath=qpath, key_mode=key_mode)
+        else:
+            agent.set_env(env)
+            agent.qpath = qpath
+            agent.eps = max(agent.eps, level_eps)
+
+        print(f"\n=== level {lvl}: {rows}x{cols}, {mines} mines, "
+              f"target win-rate {threshold:.2f} ===")
+
+        stats = TrainingStats(window=window)
+        level_start = time.time()
+        passed = False
+
+        for ep in range(1, max_episodes + 1):
+            run_episode(env, agent, stats)
+            recent_rate = stats.win.window.mean
+
+            if ep % report_every == 0:
+                print(f"L{lvl} " + report_line(
+                    ep, stats, agent, time.time() - level_start
+                ))
+
+            if stats.win.window.full and recent_rate >= threshold:
+                passed = True
+                break
+
+        agent.save()
+        results.append((lvl, passed, ep, recent_rate))
+        print(
+            f"level {lvl} {'passed' if passed else 'NOT passed'} after "
+            f"{ep} episodes (win-rate={recent_rate:.2f}, "
+            f"time={time.time() - level_start:.1f}s)"
+        )
+
+    print("\nCurriculum finished")
+    print(f"Total time: {time.time() - start_time:.1f}s")
+    return results
+
+
+if __name__ == "__main__":
+    curriculum_loop(
+        max_episodes=20000,   # 🔹 CHANGE THIS NUMBER IF NEEDED
+        key_mode="region"
+    )
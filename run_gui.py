@@ -1,5 +1,7 @@
 # run_gui.py
+import sys
 from src.ui import MinesweeperUI
 if __name__ == "__main__":
-    ui = MinesweeperUI()
+    # python run_gui.py [episode_log]  → replay a recorded log
+    ui = MinesweeperUI(replay_path=sys.argv[1] if len(sys.argv) > 1 else None)
     ui.run()
@@ -0,0 +1,69 @@
+# run_offline.py
+import os
+import time
+from src.env import make_env
+from src.agent import QAgent
+from src.offline import (
+    TransitionDataset, collect, from_episode_log, train_offline,
+    reward_config, same_keys
+)
+from src.config import ROWS, COLS, MINES
+
+
+def offline_loop(
+    episodes=20000,       # 🔹 episodes to generate when no log / dataset is given
+    log_path=None,        # EpisodeRecorder log to ingest instead
+    dataset_path=None,    # cached .npz dataset (loaded if present, else written)
+    sweeps=50
+):
+    """
+    Offline fitted Q-iteration.
+    Builds a transition dataset, fits the Q-table in vectorized sweeps
+    and saves qtable.json.
+    """
+
+    env = make_env(rows=ROWS, cols=COLS, mines=MINES)
+    agent = QAgent(env)
+    start_time = time.time()
+
+    data = None
+    if dataset_path and os.path.exists(dataset_path):
+        try:
+            data = TransitionDataset.load(dataset_path)
+        except ValueError as e:
+            print("[offline]", e)
+        if data is not None and not same_keys(data.scheme, agent.scheme()):
+            print(f"[offline] {dataset_path} has other Q-keys, rebuilding")
+            data = None
+        if data is not None and data.reward_cfg != reward_config():
+            print("[offline] reward config changed, rewards rebuilt from config")
+
+    if data is None:
+        if log_path:
+            data = from_episode_log(agent, log_path)
+        else:
+            data = collect(agent, episodes)
+        if dataset_path:
+            data.save(dataset_path)
+
+    data.freeze()
+    print(
+        f"dataset: {len(data)} transitions | "
+        f"{len(data.keys)} keys | "
+        f"time={time.time() - start_time:.1f}s"
+    )
+
+    deltas = train_offline(agent, data, sweeps=sweeps)
+    for i, d in enumerate(deltas, 1):
+        print(f"sweep {i:3d} | max |dQ|={d:.6f}")
+
+    agent.save()
+    print("\nOffline training finished")
+    print(f"Total time: {time.time() - start_time:.1f}s")
+
+
+if __name__ == "__main__":
+    offline_loop(
+        episodes=20000,    # 🔹 CHANGE THIS NUMBER IF NEEDED
+        sweeps=50
+    )
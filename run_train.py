@@ -1,73 +1,92 @@
 # run_train.py
 import time
-from src.env import MinesweeperEnv
+from src.env import make_env
 from src.agent import QAgent
+from src.recorder import EpisodeRecorder
+from src.stats import TrainingStats
 from src.config import ROWS, COLS, MINES
 
 
+def run_episode(env, agent, stats, recorder=None, greedy=False):
+    """
+    Play one training episode (select / step / update) and record it in
+    `stats` (and `recorder` if given). Shared by all headless loops.
+    """
+    obs = env.reset()
+    done = False
+    ep_reward = 0.0
+
+    while not done:
+        legal = env.legal_actions()
+        if not legal:
+            break
+
+        action = agent.select(obs, legal, greedy=greedy)
+        reward, done, _ = env.open_cell(action)
+        next_obs = env.observe()
+        if recorder:
+            recorder.record(action, reward)
+
+        stats.update(agent.update(obs, action, reward, next_obs, done))
+        ep_reward += reward
+        obs = next_obs
+
+    if recorder:
+        recorder.end_episode(env)
+
+    stats.end_episode(env.win, ep_reward, env.steps)
+    return env.win
+
+
+def report_line(ep, stats, agent, elapsed):
+    return (
+        f"EP {ep:5d} | "
+        f"{stats.summary()} | "
+        f"overall={stats.overall_win_rate:.2f} | "
+        f"eps={agent.eps:.3f} | "
+        f"time={elapsed:.1f}s"
+    )
+
+
 def train_loop(
     episodes=8000,        # 🔹 CHANGE THIS TO TRAIN MORE / LESS
     report_every=100,
-    save_every=500
+    save_every=500,
+    record_path=None      # e.g. EPISODE_LOG_PATH to log every episode
 ):
     """
     Headless Q-learning training loop.
     Trains without UI and saves qtable.json.
     """
 
-    env = MinesweeperEnv(rows=ROWS, cols=COLS, mines=MINES)
+    env = make_env(rows=ROWS, cols=COLS, mines=MINES)
     agent = QAgent(env)
+    recorder = EpisodeRecorder(record_path) if record_path else None
 
-    wins = 0
-    recent_wins = []
+    stats = TrainingStats(window=100)
     start_time = time.time()
 
-    for ep in range(1, episodes + 1):
-        obs = env.reset()
-        done = False
-
-        while not done:
-            legal = env.legal_actions()
-            if not legal:
-                break
-
-            action = agent.select(obs, legal, greedy=False)
-            reward, done, _ = env.open_cell(action)
-            next_obs = env.observe()
-
-            agent.update(obs, action, reward, next_obs, done)
-            obs = next_obs
-
-        # record win
-        win = 1 if env.win else 0
-        wins += win
-        recent_wins.append(win)
-        if len(recent_wins) > 100:
-            recent_wins.pop(0)
-
-        # progress report
-        if ep % report_every == 0:
-            recent_rate = sum(recent_wins) / len(recent_wins)
-            overall_rate = wins / ep
-            elapsed = time.time() - start_time
-
-            print(
-                f"EP {ep:5d} | "
-                f"recent win-rate={recent_rate:.2f} | "
-                f"overall={overall_rate:.2f} | "
-                f"eps={agent.eps:.3f} | "
-                f"time={elapsed:.1f}s"
-            )
-
-        # save Q-table periodically
-        if ep % save_every == 0:
-            agent.save()
-
-    # final save
-    agent.save()
+    try:
+        for ep in range(1, episodes + 1):
+            run_episode(env, agent, stats, recorder)
+
+            # progress report
+            if ep % report_every == 0:
+                print(report_line(ep, stats, agent, time.time() - start_time))
+
+            # save Q-table periodically
+            if ep % save_every == 0:
+                agent.save()
+
+        # final save
+        agent.save()
+    finally:
+        if recorder:
+            recorder.close()
+
     print("\nTraining finished")
     print(f"Total episodes: {episodes}")
-    print(f"Final win rate: {wins / episodes:.2f}")
+    print(f"Final win rate: {stats.overall_win_rate:.2f}")
 
 
 if __name__ == "__main__":
@@ -4,7 +4,11 @@ import json
 import random
 import tempfile
 from collections import defaultdict
-from .config import ALPHA, GAMMA, EPS_START, EPS_END, EPS_DECAY, QTABLE_PATH
+from functools import lru_cache
+from .config import (
+    ALPHA, GAMMA, EPS_START, EPS_END, EPS_DECAY, QTABLE_PATH,
+    SYMMETRY, KEY_MODE
+)
 
 # ---------- state encoding ----------
 
@@ -33,16 +37,140 @@ def sa_key(state, action):
     return f"{state}|{action}"
 
 
+# ---------- board symmetry ----------
+
+@lru_cache(maxsize=None)
+def symmetry_maps(rows, cols):
+    """
+    Cell permutations of the board's symmetry group.
+    Square boards: 4 rotations x 2 flips (8 maps).
+    Rectangular boards: identity, both flips, 180-degree rotation (4 maps).
+    """
+    def build(f):
+        return tuple(
+            f(r, c)[0] * cols + f(r, c)[1]
+            for r in range(rows) for c in range(cols)
+        )
+
+    R, C = rows - 1, cols - 1
+    maps = [
+        build(lambda r, c: (r, c)),
+        build(lambda r, c: (R - r, c)),
+        build(lambda r, c: (r, C - c)),
+        build(lambda r, c: (R - r, C - c)),
+    ]
+    if rows == cols:
+        maps += [
+            build(lambda r, c: (c, r)),
+            build(lambda r, c: (C - c, r)),
+            build(lambda r, c: (c, R - r)),
+            build(lambda r, c: (C - c, R - r)),
+        ]
+    return tuple(maps)
+
+
+@lru_cache(maxsize=None)
+def canonical_cells(rows, cols):
+    """
+    Lookup table: cell index -> smallest index in its symmetry orbit.
+    """
+    maps = symmetry_maps(rows, cols)
+    return tuple(min(m[i] for m in maps) for i in range(rows * cols))
+
+
+# ---------- board-size independent keys ----------
+
+@lru_cache(maxsize=None)
+def region_cells(rows, cols):
+    """
+    Lookup table: cell index -> "corner" / "edge" / "inner".
+    Same vocabulary on every board size, so tables transfer across levels.
+    """
+    out = []
+    for r in range(rows):
+        for c in range(cols):
+            border = (r in (0, rows - 1)) + (c in (0, cols - 1))
+            out.append(("inner", "edge", "corner")[border])
+    return tuple(out)
+
+
+def cell_keys(rows, cols, key_mode=KEY_MODE, symmetry=SYMMETRY):
+    """
+    Lookup table used in place of the raw cell index in Q-keys
+    (None = raw index).
+    """
+    if key_mode == "region":
+        return region_cells(rows, cols)
+    if key_mode != "cell":
+        raise ValueError(f"unknown key_mode: {key_mode!r}")
+    return canonical_cells(rows, cols) if symmetry else None
+
+
+# ---------- key scheme stored with the table ----------
+
+SCHEME_KEY = "__scheme__"
+LEGACY_SCHEME = {"key_mode": "cell", "symmetry": False}
+
+
+def same_key_space(a, b):
+    """
+    True if two schemes name cells the same way.
+    Region keys ignore symmetry (regions are already symmetric).
+    """
+    if a["key_mode"] != b["key_mode"]:
+        return False
+    return a["key_mode"] == "region" or a["symmetry"] == b["symmetry"]
+
+
+def qtable_path(key_mode=KEY_MODE, symmetry=SYMMETRY):
+    """
+    Default table file per key scheme, so schemes never share a file.
+    """
+    if key_mode == "cell" and not symmetry:
+        return QTABLE_PATH
+    suffix = "region" if key_mode == "region" else "sym"
+    return QTABLE_PATH.replace(".json", f"_{suffix}.json")
+
+
+def remap_table(q, old_shape, new_shape, symmetry=SYMMETRY):
+    """
+    Carry a "cell"-keyed table to another board size.
+    Each new cell takes the entries of the old cell at the same relative
+    position (nearest-neighbour scaling of the board).
+    """
+    (old_r, old_c), (new_r, new_c) = old_shape, new_shape
+    old_key = cell_keys(old_r, old_c, "cell", symmetry)
+    new_key = cell_keys(new_r, new_c, "cell", symmetry)
+
+    by_cell = defaultdict(dict)
+    for k, v in q.items():
+        state, a = k.rsplit("|", 1)
+        if a.isdigit():
+            by_cell[int(a)][state] = v
+
+    out = {}
+    for j in range(new_r * new_c):
+        r, c = divmod(j, new_c)
+        src = (r * old_r // new_r) * old_c + c * old_c // new_c
+        if old_key is not None:
+            src = old_key[src]
+        dst = new_key[j] if new_key is not None else j
+        for state, v in by_cell.get(src, {}).items():
+            out.setdefault(sa_key(state, dst), v)
+    return out
+
+
 class QAgent:
     """
     Tabular Q-learning agent.
     """
 
-    def __init__(self, env, qpath=QTABLE_PATH,
-                 alpha=ALPHA, gamma=GAMMA):
+    def __init__(self, env, qpath=None,
+                 alpha=ALPHA, gamma=GAMMA, symmetry=SYMMETRY,
+                 key_mode=KEY_MODE):
         self.env = env
 
-        self.qpath = qpath
+        self.qpath = qpath or qtable_path(key_mode, symmetry)
         self.alpha = alpha
         self.gamma = gamma
 
@@ -52,19 +180,60 @@ class QAgent:
 
         self.q = defaultdict(float)
 
+        # encode_state is rotation / flip invariant, so mapping the action
+        # to its canonical cell (or its region) is enough to share entries
+        self.symmetry = symmetry
+        self.key_mode = key_mode
+        self.cell_key = cell_keys(env.rows, env.cols, key_mode, symmetry)
+
         # load q-table if exists
         if os.path.exists(self.qpath):
+            data = None
             try:
                 with open(self.qpath, "r", encoding="utf-8") as f:
                     data = json.load(f)
-                for k, v in data.items():
-                    self.q[k] = float(v)
-                print(f"[agent] loaded {len(self.q)} Q entries")
             except Exception as e:
                 print("[agent] failed to load qtable:", e)
+            if data is not None:
+                self._load_table(data)
 
     # ---------- persistence ----------
 
+    def scheme(self):
+        """
+        What the Q-keys mean; saved with the table.
+        """
+        return {
+            "key_mode": self.key_mode,
+            "symmetry": self.symmetry,
+            "rows": self.env.rows,
+            "cols": self.env.cols,
+        }
+
+    def _load_table(self, data):
+        # tables saved before the scheme was stored use raw cell indices
+        saved = data.pop(SCHEME_KEY, LEGACY_SCHEME)
+        mine = self.scheme()
+        if not same_key_space(saved, mine):
+            # refuse rather than mix schemes (save() would persist the mix)
+            raise ValueError(
+                f"{self.qpath} uses key_mode={saved['key_mode']!r}, "
+                f"symmetry={saved['symmetry']}; agent uses "
+                f"key_mode={mine['key_mode']!r}, symmetry={mine['symmetry']}"
+            )
+
+        # "cell" tables are tied to the board they were trained on
+        shape = (saved.get("rows", mine["rows"]), saved.get("cols", mine["cols"]))
+        if self.key_mode == "cell" and shape != (mine["rows"], mine["cols"]):
+            data = remap_table(
+                data, shape, (mine["rows"], mine["cols"]), self.symmetry
+            )
+            print(f"[agent] remapped table from {shape[0]}x{shape[1]}")
+
+        for k, v in data.items():
+            self.q[k] = float(v)
+        print(f"[agent] loaded {len(self.q)} Q entries")
+
     def _atomic_write(self, data):
         os.makedirs(os.path.dirname(self.qpath), exist_ok=True)
         fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.qpath))
@@ -75,9 +244,31 @@ class QAgent:
         os.replace(tmp, self.qpath)
 
     def save(self):
-        self._atomic_write(dict(self.q))
+        self._atomic_write({SCHEME_KEY: self.scheme(), **self.q})
         print(f"[agent] saved {len(self.q)} Q entries")
 
+    # ---------- keys ----------
+
+    def key(self, obs, a):
+        s = encode_state(obs, a, self.env)
+        if self.cell_key is not None:
+            a = self.cell_key[a]
+        return sa_key(s, a)
+
+    def set_env(self, env):
+        """
+        Switch to another board (e.g. next curriculum level).
+        "cell" tables are remapped to the new size, "region" ones carry over.
+        """
+        old_shape = (self.env.rows, self.env.cols)
+        self.env = env
+        self.cell_key = cell_keys(env.rows, env.cols, self.key_mode, self.symmetry)
+
+        if self.key_mode == "cell" and old_shape != (env.rows, env.cols):
+            self.q = defaultdict(float, remap_table(
+                self.q, old_shape, (env.rows, env.cols), self.symmetry
+            ))
+
     # ---------- action selection ----------
 
     def select(self, obs, legal, greedy=False):
@@ -86,8 +277,7 @@ class QAgent:
 
         best, bestv = None, -1e9
         for a in legal:
-            s = encode_state(obs, a, self.env)
-            v = self.q.get(sa_key(s, a), 0.0)
+            v = self.q.get(self.key(obs, a), 0.0)
             if v > bestv:
                 bestv, best = v, a
 
@@ -96,30 +286,31 @@ class QAgent:
     # ---------- learning ----------
 
     def update(self, obs, action, reward, next_obs, done):
-        s = encode_state(obs, action, self.env)
-        k = sa_key(s, action)
+        k = self.key(obs, action)
         cur = self.q[k]
 
         if done:
             target = reward
         else:
-            next_legal = [
-                i for i in range(self.env.n)
-                if not next_obs["opened"][i] and not next_obs["avoid"][i]
-            ]
+            # large-board observations carry their own candidate list
+            next_legal = next_obs.get("legal")
+            if next_legal is None:
+                next_legal = [
+                    i for i in range(self.env.n)
+                    if not next_obs["opened"][i] and not next_obs["avoid"][i]
+                ]
             if not next_legal:
                 target = reward
             else:
                 max_next = max(
-                    self.q.get(
-                        sa_key(encode_state(next_obs, a2, self.env), a2),
-                        0.0
-                    )
+                    self.q.get(self.key(next_obs, a2), 0.0)
                     for a2 in next_legal
                 )
                 target = reward + self.gamma * max_next
 
-        self.q[k] = cur + self.alpha * (target - cur)
+        td = target - cur
+        self.q[k] = cur + self.alpha * td
 
         # epsilon decay
         self.eps = max(self.eps_end, self.eps * self.eps_decay)
+        return td
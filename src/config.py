@@ -8,6 +8,22 @@ ROWS = 10
 COLS = 10
 MINES = 3
 
+# share Q entries between cells related by board rotations / flips
+SYMMETRY = False
+
+# what identifies the candidate cell in Q-keys:
+#   "cell"   absolute cell index (tied to ROWS x COLS)
+#   "region" corner / edge / inner (same keys on every board size)
+KEY_MODE = "cell"
+
+# large-board mode (e.g. 200x200): chunked sparse state, agent only
+# evaluates frontier cells (+ one sampled interior cell)
+LARGE_MODE = False
+CHUNK = 32               # chunk side in cells
+MAX_CANDIDATES = 256     # frontier cells evaluated per step (sampled above)
+VIEW_ROWS = 12           # UI viewport in cells when the board is bigger
+VIEW_COLS = 16
+
 CELL_PIX = 64
 MARGIN = 12
 
@@ -24,6 +40,19 @@ EPS_END = 0.02
 EPS_DECAY = 0.9992
 
 
+# ==============================
+# Curriculum (run_curriculum.py)
+# ==============================
+# (rows, cols, mines, win-rate needed to advance)
+LEVELS = [
+    (5, 5, 2, 0.80),
+    (8, 8, 6, 0.70),
+    (10, 10, 10, 0.60),
+    (16, 16, 40, 0.50),
+    (16, 30, 99, 0.30),
+]
+
+
 # ==============================
 # Reward shaping
 # ==============================
@@ -45,3 +74,6 @@ MODELS_DIR = os.path.join(BASE_DIR, "models")
 os.makedirs(MODELS_DIR, exist_ok=True)
 
 QTABLE_PATH = os.path.join(MODELS_DIR, "qtable.json")
+EPISODE_LOG_PATH = os.path.join(MODELS_DIR, "episodes.bin")
+# one table per key mode and level, e.g. qtable_curriculum_region_L3.json
+CURRICULUM_QTABLE_PATH = os.path.join(MODELS_DIR, "qtable_curriculum_{}_L{}.json")
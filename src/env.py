@@ -1,9 +1,11 @@
 # src/env.py
 import random
+from collections import deque
 from .config import (
     ROWS, COLS, MINES,
     REWARD_SAFE, REWARD_ZERO, REWARD_WIN,
-    PENALTY_MINE, STEP_PENALTY
+    PENALTY_MINE, STEP_PENALTY,
+    LARGE_MODE, CHUNK, MAX_CANDIDATES
 )
 
 class MinesweeperEnv:
@@ -70,10 +72,25 @@ class MinesweeperEnv:
         for i in candidates[:self.mines]:
             self.mine[i] = 1
 
+        self._compute_adj()
+        self.placed = True
+
+    def load_layout(self, mine_cells):
+        """
+        Use a fixed mine layout (e.g. from a recorded episode).
+        """
+        for i in mine_cells:
+            self.mine[i] = 1
+
+        self._compute_adj()
+        self.placed = True
+
+    def _compute_adj(self):
         for i in range(self.n):
             self.adj[i] = sum(self.mine[n] for n in self.neighbors(i))
 
-        self.placed = True
+    def mine_cells(self):
+        return [i for i in range(self.n) if self.mine[i]]
 
     # ---------- observation ----------
 
@@ -108,7 +125,7 @@ class MinesweeperEnv:
 
         # mine
         if self.mine[i]:
-            self.opened[i] = 1
+            self._open(i)
             self.done = True
             self.win = False
             return PENALTY_MINE, True, {"mine": True}
@@ -120,28 +137,36 @@ class MinesweeperEnv:
             self._flood(i)
             reward += REWARD_ZERO
         else:
-            self.opened[i] = 1
+            self._open(i)
 
         # win check
-        safe_opened = sum(
-            1 for j in range(self.n)
-            if self.opened[j] and not self.mine[j]
-        )
-        if safe_opened == self.n - self.mines:
+        if self._safe_opened() == self.n - self.mines:
             self.done = True
             self.win = True
             reward += REWARD_WIN
 
         return reward, self.done, {}
 
+    def _open(self, i):
+        self.opened[i] = 1
+
+    def _avoid(self, i):
+        self.avoid[i] = 1
+
+    def _safe_opened(self):
+        return sum(
+            1 for j in range(self.n)
+            if self.opened[j] and not self.mine[j]
+        )
+
     # ---------- flood ----------
 
     def _flood(self, start):
-        q = [start]
+        q = deque([start])
         seen = {start}
         while q:
-            cur = q.pop(0)
-            self.opened[cur] = 1
+            cur = q.popleft()
+            self._open(cur)
             if self.adj[cur] == 0:
                 for nb in self.neighbors(cur):
                     if nb not in seen and not self.opened[nb]:
@@ -156,34 +181,282 @@ class MinesweeperEnv:
         Returns True if something changed.
         """
         changed = False
-
         for i in range(self.n):
-            if not self.opened[i]:
-                continue
-
-            number = self.adj[i]
-            if number <= 0:
-                continue
-
-            neigh = self.neighbors(i)
-            covered = [n for n in neigh if not self.opened[n]]
-
-            if not covered:
-                continue
-
-            # Rule 1: all covered are mines
-            if number == len(covered):
-                for n in covered:
-                    if not self.avoid[n]:
-                        self.avoid[n] = 1
-                        changed = True
-
-            # Rule 2: all mines accounted → rest safe
-            avoided = sum(self.avoid[n] for n in neigh)
-            if avoided == number:
-                for n in covered:
-                    if not self.avoid[n]:
-                        self.open_cell(n)
-                        changed = True
+            changed |= self._infer_at(i)
+        return changed
+
+    def _infer_at(self, i):
+        if not self.opened[i]:
+            return False
+
+        number = self.adj[i]
+        if number <= 0:
+            return False
+
+        neigh = self.neighbors(i)
+        covered = [n for n in neigh if not self.opened[n]]
 
+        if not covered:
+            return False
+
+        changed = False
+
+        # Rule 1: all covered are mines
+        if number == len(covered):
+            for n in covered:
+                if not self.avoid[n]:
+                    self._avoid(n)
+                    changed = True
+
+        # Rule 2: all mines accounted → rest safe
+        avoided = sum(self.avoid[n] for n in neigh)
+        if avoided == number:
+            for n in covered:
+                if not self.avoid[n]:
+                    self.open_cell(n)
+                    changed = True
+
+        return changed
+
+
+def make_env(rows=ROWS, cols=COLS, mines=MINES, seed=None, large=LARGE_MODE):
+    cls = LargeMinesweeperEnv if large else MinesweeperEnv
+    return cls(rows=rows, cols=cols, mines=mines, seed=seed)
+
+
+# =========================================================
+# Large boards
+# =========================================================
+
+class ChunkedGrid:
+    """
+    Byte-per-cell grid stored as CHUNK x CHUNK blocks.
+    Blocks are allocated on first write, untouched regions cost nothing.
+    """
+
+    def __init__(self, cols, chunk=CHUNK):
+        self.cols = cols
+        self.chunk = chunk
+        self.blocks = {}
+
+    def _loc(self, i):
+        r, c = divmod(i, self.cols)
+        br, r = divmod(r, self.chunk)
+        bc, c = divmod(c, self.chunk)
+        return (br, bc), r * self.chunk + c
+
+    def __getitem__(self, i):
+        key, off = self._loc(i)
+        block = self.blocks.get(key)
+        return block[off] if block is not None else 0
+
+    def __setitem__(self, i, v):
+        key, off = self._loc(i)
+        block = self.blocks.get(key)
+        if block is None:
+            if not v:
+                return
+            block = self.blocks[key] = bytearray(self.chunk * self.chunk)
+        block[off] = v
+
+
+class Adjacency:
+    """
+    Adjacent-mine counts computed on demand from the mine grid.
+    """
+
+    def __init__(self, env):
+        self.env = env
+
+    def __getitem__(self, i):
+        mine = self.env.mine
+        return sum(mine[n] for n in self.env.neighbors(i))
+
+
+class LargeMinesweeperEnv(MinesweeperEnv):
+    """
+    Same game on boards too big for the dense lists (e.g. 200x200+):
+    - opened / avoid / mine in ChunkedGrid, adj computed on demand
+    - covered, non-avoided cells bordering opened ones tracked as a
+      frontier set
+    - safe-cell counter instead of a full-board win scan
+    - covered, non-avoided cells away from the frontier ("interior")
+      counted per chunk, so an interior cell is sampled without a scan
+    - legal_actions() = frontier (sampled down to max_candidates)
+      + one sampled interior cell
+    - observe() only covers the candidates and their neighbours
+    Per-step cost is O(frontier) (candidate sampling, inference) plus
+    the observe() window of at most max_candidates cells; it is
+    independent of rows * cols only as long as the frontier stays bounded.
+    """
+
+    def __init__(self, rows=ROWS, cols=COLS, mines=MINES, seed=None,
+                 chunk=CHUNK, max_candidates=MAX_CANDIDATES):
+        self.chunk = chunk
+        self.max_candidates = max_candidates
+        super().__init__(rows=rows, cols=cols, mines=mines, seed=seed)
+
+    # ---------- core ----------
+
+    def reset(self):
+        self.mine = ChunkedGrid(self.cols, self.chunk)
+        self.opened = ChunkedGrid(self.cols, self.chunk)
+        self.avoid = ChunkedGrid(self.cols, self.chunk)
+        self.adj = Adjacency(self)
+        self.mine_list = []
+
+        self.frontier = set()
+        self.safe_count = 0
+        self.candidates = None      # legal_actions() cache for this step
+
+        # interior bookkeeping: cells that left the interior (opened,
+        # frontier or avoided; they never come back), remaining count per
+        # chunk, and the chunks that still have interior cells
+        self.left = ChunkedGrid(self.cols, self.chunk)
+        self.interior = {}
+        self.live = [
+            (br, bc)
+            for br in range(-(-self.rows // self.chunk))
+            for bc in range(-(-self.cols // self.chunk))
+        ]
+        self.live_pos = {key: k for k, key in enumerate(self.live)}
+
+        self.placed = False
+        self.done = False
+        self.win = False
+        self.steps = 0
+        return self.observe()
+
+    # ---------- mines ----------
+
+    def place_mines(self, safe_i):
+        forbidden = set(self.neighbors(safe_i) + [safe_i])
+        k = min(self.mines + len(forbidden), self.n)
+        picks = [i for i in self.rng.sample(range(self.n), k)
+                 if i not in forbidden]
+        self.load_layout(picks[:self.mines])
+
+    def load_layout(self, mine_cells):
+        self.mine_list = list(mine_cells)
+        for i in self.mine_list:
+            self.mine[i] = 1
+        self.placed = True
+
+    def mine_cells(self):
+        return list(self.mine_list)
+
+    # ---------- observation ----------
+
+    def observe(self):
+        legal = self.legal_actions()
+        cells = set(legal)
+        for a in legal:
+            cells.update(self.neighbors(a))
+
+        opened = {i: self.opened[i] for i in cells}
+        return {
+            "opened": opened,
+            "adj": {i: self.adj[i] if opened[i] else 0 for i in cells},
+            "avoid": {i: self.avoid[i] for i in cells},
+            "legal": legal,
+        }
+
+    # ---------- actions ----------
+
+    def legal_actions(self):
+        if self.candidates is None:
+            self.candidates = self._sample_candidates()
+        return list(self.candidates)
+
+    def _sample_candidates(self):
+        out = list(self.frontier)
+        if len(out) > self.max_candidates:
+            out = self.rng.sample(out, self.max_candidates)
+
+        # one interior representative
+        i = self._sample_interior()
+        if i is not None:
+            out.append(i)
+        return out
+
+    def _chunk_box(self, key):
+        r0, c0 = key[0] * self.chunk, key[1] * self.chunk
+        return r0, c0, min(self.chunk, self.rows - r0), min(self.chunk, self.cols - c0)
+
+    def _sample_interior(self):
+        """
+        Random interior cell: pick a chunk that still has some, probe it,
+        scan it (at most CHUNK x CHUNK cells) if the probes miss.
+        """
+        if not self.live:
+            return None
+        r0, c0, h, w = self._chunk_box(self.rng.choice(self.live))
+
+        for _ in range(16):
+            i = (r0 + self.rng.randrange(h)) * self.cols + c0 + self.rng.randrange(w)
+            if not self.left[i]:
+                return i
+        return self.rng.choice([
+            r * self.cols + c
+            for r in range(r0, r0 + h) for c in range(c0, c0 + w)
+            if not self.left[r * self.cols + c]
+        ])
+
+    def _leave_interior(self, i):
+        if self.left[i]:
+            return
+        self.left[i] = 1
+        key = self.left._loc(i)[0]
+        count = self.interior.get(key)
+        if count is None:
+            _, _, h, w = self._chunk_box(key)
+            count = h * w
+        count -= 1
+        self.interior[key] = count
+        if not count:
+            # swap-remove from the live list
+            k = self.live_pos.pop(key)
+            last = self.live.pop()
+            if last != key:
+                self.live[k] = last
+                self.live_pos[last] = k
+
+    # ---------- bookkeeping ----------
+
+    def _open(self, i):
+        if self.opened[i]:
+            return
+        self.opened[i] = 1
+        self.frontier.discard(i)
+        self._leave_interior(i)
+        if not self.mine[i]:
+            self.safe_count += 1
+        for nb in self.neighbors(i):
+            if not self.opened[nb] and not self.avoid[nb]:
+                self.frontier.add(nb)
+                self._leave_interior(nb)
+        self.candidates = None
+
+    def _avoid(self, i):
+        self.avoid[i] = 1
+        self.frontier.discard(i)
+        self._leave_interior(i)
+        self.candidates = None
+
+    def _safe_opened(self):
+        return self.safe_count
+
+    # ---------- deterministic logic ----------
+
+    def deterministic_inference_once(self):
+        """
+        Same rules as the base env, restricted to numbers on the frontier.
+        """
+        numbers = {
+            n for f in list(self.frontier) for n in self.neighbors(f)
+            if self.opened[n]
+        }
+        changed = False
+        for i in numbers:
+            changed |= self._infer_at(i)
         return changed
@@ -0,0 +1,301 @@
+# src/offline.py
+import json
+from array import array
+import numpy as np
+from . import config
+from .agent import same_key_space
+from .recorder import EpisodeLog
+
+# step outcome, the reward is rebuilt from these and the current config
+SAFE, ZERO, MINE = 0, 1, 2
+
+
+def reward_config():
+    return {
+        "REWARD_SAFE": config.REWARD_SAFE,
+        "REWARD_ZERO": config.REWARD_ZERO,
+        "REWARD_WIN": config.REWARD_WIN,
+        "PENALTY_MINE": config.PENALTY_MINE,
+        "STEP_PENALTY": config.STEP_PENALTY,
+    }
+
+
+def same_keys(a, b):
+    """
+    True if two key schemes (QAgent.scheme()) produce interchangeable keys.
+    """
+    if not same_key_space(a, b):
+        return False
+    return a["key_mode"] == "region" or (a["rows"], a["cols"]) == (b["rows"], b["cols"])
+
+
+class TransitionDataset:
+    """
+    Columnar (state-action, reward components, next-legal, done) transitions.
+
+    Every Q-key seen is given an integer id, so a transition is stored as
+      sa        id of the key that was updated
+      kind      SAFE / ZERO (flood) / MINE
+      win       step won the game
+      done      terminal flag
+      next_sa   ids of the keys of all legal next actions (CSR layout:
+                next_ptr[t]:next_ptr[t+1] slices next_sa for transition t)
+    Rewards are not stored, rewards() rebuilds them from the current
+    reward config, so a reward-shaping change needs no new play.
+    """
+
+    def __init__(self, scheme=None):
+        self.keys = []
+        self.key_id = {}
+        self.scheme = scheme            # QAgent.scheme() of the keys
+        self.reward_cfg = None          # reward config at build time (info)
+
+        self._sa = array("i")
+        self._kind = array("b")
+        self._win = array("b")
+        self._done = array("b")
+        self._next_ptr = array("q", [0])
+        self._next_sa = array("i")
+
+        self.frozen = False
+
+    # ---------- building ----------
+
+    def _id(self, k):
+        i = self.key_id.get(k)
+        if i is None:
+            i = self.key_id[k] = len(self.keys)
+            self.keys.append(k)
+        return i
+
+    def bind(self, agent):
+        """
+        Tie the dataset to agent's key scheme (ValueError on mismatch).
+        """
+        if self.scheme is None:
+            self.scheme = agent.scheme()
+            self.reward_cfg = reward_config()
+        elif not same_keys(self.scheme, agent.scheme()):
+            raise ValueError(
+                f"dataset keys {self.scheme} do not match agent keys "
+                f"{agent.scheme()}"
+            )
+
+    def add(self, agent, obs, action, kind, win, next_obs, next_legal, done):
+        self._sa.append(self._id(agent.key(obs, action)))
+        self._kind.append(kind)
+        self._win.append(1 if win else 0)
+        self._done.append(1 if done else 0)
+        if not done:
+            # cells sharing a key (region / symmetric keys) are stored once
+            self._next_sa.extend(
+                {self._id(agent.key(next_obs, a2)) for a2 in next_legal}
+            )
+        self._next_ptr.append(len(self._next_sa))
+
+    def freeze(self):
+        """
+        Convert the columns to NumPy arrays (smallest id dtype that fits).
+        """
+        if self.frozen:
+            return self
+        id_t = np.min_scalar_type(max(len(self.keys) - 1, 0))
+        self.sa = np.frombuffer(self._sa, dtype=np.int32).astype(id_t)
+        self.kind = np.frombuffer(self._kind, dtype=np.int8).copy()
+        self.win = np.frombuffer(self._win, dtype=np.int8).astype(bool)
+        self.done = np.frombuffer(self._done, dtype=np.int8).astype(bool)
+        self.next_ptr = np.frombuffer(self._next_ptr, dtype=np.int64).copy()
+        self.next_sa = np.frombuffer(self._next_sa, dtype=np.int32).astype(id_t)
+        self._drop_builders()
+        self.frozen = True
+        return self
+
+    def _drop_builders(self):
+        del self._sa, self._kind, self._win, self._done
+        del self._next_ptr, self._next_sa
+
+    def rewards(self, cfg=None):
+        """
+        Per-transition reward under `cfg` (default: current config),
+        mirroring MinesweeperEnv.open_cell.
+        """
+        self.freeze()
+        cfg = cfg or reward_config()
+        safe = (cfg["REWARD_SAFE"] + cfg["STEP_PENALTY"]
+                + cfg["REWARD_ZERO"] * (self.kind == ZERO)
+                + cfg["REWARD_WIN"] * self.win)
+        return np.where(self.kind == MINE, cfg["PENALTY_MINE"], safe)
+
+    def __len__(self):
+        return len(self.sa) if self.frozen else len(self._sa)
+
+    # ---------- persistence ----------
+
+    def save(self, path):
+        self.freeze()
+        np.savez_compressed(
+            path,
+            keys=np.array(self.keys, dtype=str),
+            scheme=json.dumps(self.scheme),
+            reward_cfg=json.dumps(self.reward_cfg),
+            sa=self.sa, kind=self.kind, win=self.win, done=self.done,
+            next_ptr=self.next_ptr, next_sa=self.next_sa,
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as z:
+            if "kind" not in z or "scheme" not in z:
+                raise ValueError(f"{path}: old dataset format, rebuild it")
+            data = cls(scheme=json.loads(str(z["scheme"])))
+            data.reward_cfg = json.loads(str(z["reward_cfg"]))
+            data.keys = z["keys"].tolist()
+            data.key_id = {k: i for i, k in enumerate(data.keys)}
+            data.sa = z["sa"]
+            data.kind = z["kind"]
+            data.win = z["win"]
+            data.done = z["done"]
+            data.next_ptr = z["next_ptr"]
+            data.next_sa = z["next_sa"]
+        data._drop_builders()
+        data.frozen = True
+        return data
+
+
+# ---------- dataset sources ----------
+
+def _play(data, agent, env, actions=None, greedy=False):
+    """
+    One episode. Replays `actions` if given, otherwise asks the agent.
+    """
+    obs = env.observe()
+    steps = iter(actions) if actions is not None else None
+
+    while not env.done:
+        legal = env.legal_actions()
+        if not legal:
+            break
+        if steps is None:
+            action = agent.select(obs, legal, greedy=greedy)
+        else:
+            action = next(steps, None)
+            if action is None:
+                break
+
+        _, done, info = env.open_cell(action)
+        if info.get("illegal"):
+            continue
+        if info.get("mine"):
+            kind = MINE
+        else:
+            kind = ZERO if env.adj[action] == 0 else SAFE
+
+        next_obs = env.observe()
+        next_legal = env.legal_actions()
+        data.add(agent, obs, action, kind, env.win, next_obs, next_legal,
+                 done or not next_legal)
+        obs = next_obs
+
+
+def collect(agent, episodes, greedy=False, data=None):
+    """
+    Generate transitions by letting `agent` play agent.env.
+    """
+    data = data if data is not None else TransitionDataset()
+    data.bind(agent)
+    env = agent.env
+    for _ in range(episodes):
+        env.reset()
+        _play(data, agent, env, greedy=greedy)
+    return data
+
+
+def from_episode_log(agent, path, data=None):
+    """
+    Ingest an EpisodeRecorder log by replaying each episode's actions on its
+    recorded mine layout. Recorded rewards are ignored (see rewards()).
+    """
+    data = data if data is not None else TransitionDataset()
+    data.bind(agent)
+    env = agent.env
+    mines = env.mines
+    log = EpisodeLog(path)
+    try:
+        for i in range(len(log)):
+            ep = log[i]
+            if (ep["rows"], ep["cols"]) != (env.rows, env.cols):
+                raise ValueError(
+                    f"episode {i} is {ep['rows']}x{ep['cols']}, "
+                    f"env is {env.rows}x{env.cols}"
+                )
+            env.reset()
+            env.mines = len(ep["mines"])
+            env.load_layout(ep["mines"])
+            _play(data, agent, env, actions=ep["actions"])
+    finally:
+        log.close()
+        env.mines = mines
+        env.reset()
+    return data
+
+
+# ---------- fitted Q-iteration ----------
+
+def fitted_q_iteration(data, gamma, sweeps=50, q0=None, alpha=1.0, tol=1e-6):
+    """
+    Batch Q-learning over the whole dataset.
+    Each sweep sets every visited key to the mean of
+      reward + gamma * max(Q[next legal])
+    over its transitions (blended with `alpha`), fully vectorized.
+    Returns (q, per-sweep max |dQ|).
+    """
+    data.freeze()
+    n_keys = len(data.keys)
+    q = np.zeros(n_keys) if q0 is None else np.asarray(q0, dtype=float).copy()
+
+    counts = np.bincount(data.sa, minlength=n_keys)
+    seen = counts > 0
+    n_next = np.diff(data.next_ptr)
+    has_next = (n_next > 0) & ~data.done
+    starts = data.next_ptr[:-1][has_next]
+    reward = data.rewards()
+
+    deltas = []
+    for _ in range(sweeps):
+        max_next = np.zeros(len(data.sa))
+        if len(starts):
+            # empty segments are skipped, so consecutive starts in `starts`
+            # bound exactly one transition's next-legal slice
+            max_next[has_next] = np.maximum.reduceat(q[data.next_sa], starts)
+
+        target = reward + gamma * max_next
+        mean = np.bincount(data.sa, weights=target, minlength=n_keys)
+        mean[seen] /= counts[seen]
+
+        new_q = q.copy()
+        new_q[seen] += alpha * (mean[seen] - q[seen])
+
+        delta = float(np.abs(new_q - q).max()) if n_keys else 0.0
+        deltas.append(delta)
+        q = new_q
+        if delta < tol:
+            break
+
+    return q, deltas
+
+
+def train_offline(agent, data, sweeps=50, alpha=1.0, tol=1e-6, warm=True):
+    """
+    Fit agent.q from `data` and return the sweep deltas.
+    With warm=True the agent's current table is the starting point.
+    Call agent.save() afterwards to write the table.
+    """
+    data.bind(agent)
+    data.freeze()
+    q0 = [agent.q.get(k, 0.0) for k in data.keys] if warm else None
+    q, deltas = fitted_q_iteration(
+        data, agent.gamma, sweeps=sweeps, q0=q0, alpha=alpha, tol=tol
+    )
+    for k, v in zip(data.keys, q.tolist()):
+        agent.q[k] = v
+    return deltas
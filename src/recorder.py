@@ -0,0 +1,208 @@
+# src/recorder.py
+import os
+import struct
+from array import array
+
+# ---------- binary layout ----------
+#
+# <path>       MAGIC, then one record per episode:
+#                header  (rows u16, cols u16, n_mines u32, n_steps u32, win u8)
+#                mines   n_mines  x u32   (cell indices)
+#                actions n_steps  x u32   (cell indices)
+#                rewards n_steps  x f32
+# <path>.idx   one u64 byte offset per episode → O(1) seek to episode i
+
+MAGIC = b"MSEPLOG1"
+HEADER = struct.Struct("<HHIIB")
+OFFSET = struct.Struct("<Q")
+
+
+def _record_end(f, fidx, i, size):
+    """
+    End offset of episode i, or None if its record is torn / missing.
+    """
+    fidx.seek(i * OFFSET.size)
+    raw = fidx.read(OFFSET.size)
+    if len(raw) < OFFSET.size:
+        return None
+    (offset,) = OFFSET.unpack(raw)
+    if offset < len(MAGIC) or offset + HEADER.size > size:
+        return None
+
+    f.seek(offset)
+    _, _, n_mines, n_steps, _ = HEADER.unpack(f.read(HEADER.size))
+    end = offset + HEADER.size + 4 * (n_mines + 2 * n_steps)
+    return end if end <= size else None
+
+
+def _complete_count(f, fidx, size, n):
+    """
+    Drop index entries at the tail whose records were not fully written
+    (e.g. the process was killed between the two buffered streams).
+    """
+    while n and _record_end(f, fidx, n - 1, size) is None:
+        n -= 1
+    return n
+
+
+def _walk_records(f, start, size):
+    """
+    Offsets of the complete records from `start` on, read from their
+    headers (used to rebuild a lost / short index). Returns (offsets, end).
+    """
+    offsets = []
+    pos = start
+    while pos + HEADER.size <= size:
+        f.seek(pos)
+        rows, cols, n_mines, n_steps, _ = HEADER.unpack(f.read(HEADER.size))
+        end = pos + HEADER.size + 4 * (n_mines + 2 * n_steps)
+        if not rows or not cols or end > size:
+            break
+        offsets.append(pos)
+        pos = end
+    return offsets, pos
+
+
+class EpisodeRecorder:
+    """
+    Append-only episode log.
+    Steps are buffered in memory and written as one record per episode.
+    """
+
+    def __init__(self, path, buffering=1 << 20):
+        self.path = path
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        if not new:
+            self._repair()
+        self.f = open(path, "ab", buffering=buffering)
+        # a new log must not inherit offsets from an old index
+        self.fidx = open(path + ".idx", "wb" if new else "ab", buffering=buffering)
+        if new:
+            self.f.write(MAGIC)
+
+        self.actions = array("I")
+        self.rewards = array("f")
+
+    def _repair(self):
+        """
+        Bring log and index back in sync after an abnormal stop:
+        index entries of torn records are dropped, complete records the
+        index misses (or a lost index) are re-indexed from their headers,
+        and only a torn final record is cut from the log.
+        """
+        idx_path = self.path + ".idx"
+        if not os.path.exists(idx_path):
+            open(idx_path, "wb").close()
+
+        size = os.path.getsize(self.path)
+        with open(self.path, "rb") as f, open(idx_path, "rb") as fidx:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"not an episode log: {self.path}")
+            n = _complete_count(
+                f, fidx, size, os.path.getsize(idx_path) // OFFSET.size
+            )
+            start = _record_end(f, fidx, n - 1, size) if n else len(MAGIC)
+            missing, end = _walk_records(f, start, size)
+
+        os.truncate(idx_path, n * OFFSET.size)
+        if missing:
+            with open(idx_path, "ab") as fidx:
+                fidx.write(b"".join(OFFSET.pack(o) for o in missing))
+        os.truncate(self.path, end)
+
+    # ---------- recording ----------
+
+    def record(self, action, reward):
+        self.actions.append(action)
+        self.rewards.append(reward)
+
+    def end_episode(self, env):
+        """
+        Write the buffered steps together with env's mine layout.
+        """
+        mines = array("I", env.mine_cells())
+
+        self.fidx.write(OFFSET.pack(self.f.tell()))
+        self.f.write(HEADER.pack(
+            env.rows, env.cols, len(mines), len(self.actions),
+            1 if env.win else 0
+        ))
+        self.f.write(mines.tobytes())
+        self.f.write(self.actions.tobytes())
+        self.f.write(self.rewards.tobytes())
+
+        self.actions = array("I")
+        self.rewards = array("f")
+
+    # ---------- lifecycle ----------
+
+    def close(self):
+        # log first: an index entry must never outlive its record
+        self.f.close()
+        self.fidx.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class EpisodeLog:
+    """
+    Random-access reader for logs written by EpisodeRecorder.
+    Only the requested episode is read, so log size does not matter.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.f = open(path, "rb")
+        if self.f.read(len(MAGIC)) != MAGIC:
+            self.f.close()
+            raise ValueError(f"not an episode log: {path}")
+        self.fidx = open(path + ".idx", "rb")
+
+    def __len__(self):
+        return _complete_count(
+            self.f, self.fidx, os.path.getsize(self.path),
+            os.path.getsize(self.path + ".idx") // OFFSET.size
+        )
+
+    def __getitem__(self, i):
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError(i)
+
+        self.fidx.seek(i * OFFSET.size)
+        (offset,) = OFFSET.unpack(self.fidx.read(OFFSET.size))
+
+        self.f.seek(offset)
+        rows, cols, n_mines, n_steps, win = HEADER.unpack(
+            self.f.read(HEADER.size)
+        )
+
+        mines = array("I")
+        mines.frombytes(self.f.read(4 * n_mines))
+        actions = array("I")
+        actions.frombytes(self.f.read(4 * n_steps))
+        rewards = array("f")
+        rewards.frombytes(self.f.read(4 * n_steps))
+
+        return {
+            "rows": rows,
+            "cols": cols,
+            "mines": list(mines),
+            "actions": list(actions),
+            "rewards": list(rewards),
+            "win": bool(win),
+        }
+
+    def close(self):
+        self.f.close()
+        self.fidx.close()
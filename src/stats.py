@@ -0,0 +1,220 @@
+# src/stats.py
+import math
+from array import array
+
+# ---------- streaming aggregates (O(1) update, fixed memory) ----------
+
+
+class RollingWindow:
+    """
+    Mean / std over the last `size` values (ring buffer + running sums).
+    """
+
+    def __init__(self, size=100):
+        self.size = size
+        self.buf = array("d", [0.0] * size)
+        self.pos = 0
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def push(self, x):
+        if self.count == self.size:
+            old = self.buf[self.pos]
+            self.total -= old
+            self.total_sq -= old * old
+        else:
+            self.count += 1
+        self.buf[self.pos] = x
+        self.pos = (self.pos + 1) % self.size
+        self.total += x
+        self.total_sq += x * x
+
+        # re-sum once per lap so float drift cannot build up (amortized O(1))
+        if self.pos == 0:
+            self.total = math.fsum(self.buf)
+            self.total_sq = math.fsum(v * v for v in self.buf)
+
+    @property
+    def full(self):
+        return self.count == self.size
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def std(self):
+        if not self.count:
+            return 0.0
+        m = self.mean
+        return math.sqrt(max(self.total_sq / self.count - m * m, 0.0))
+
+
+class EWMA:
+    """
+    Exponentially decayed mean / std; `halflife` in samples.
+    Bias-corrected, so early values are not dragged towards 0.
+    """
+
+    def __init__(self, halflife=1000):
+        self.alpha = 1 - 0.5 ** (1 / halflife)
+        self.m1 = 0.0       # decayed sum of x
+        self.m2 = 0.0       # decayed sum of x * x
+        self.weight = 0.0   # decayed sum of weights (1 - (1 - alpha)^count)
+
+    def push(self, x):
+        a = self.alpha
+        self.m1 += a * (x - self.m1)
+        self.m2 += a * (x * x - self.m2)
+        self.weight += a * (1.0 - self.weight)
+
+    @property
+    def mean(self):
+        return self.m1 / self.weight if self.weight else 0.0
+
+    @property
+    def std(self):
+        if not self.weight:
+            return 0.0
+        m = self.mean
+        return math.sqrt(max(self.m2 / self.weight - m * m, 0.0))
+
+
+class P2Quantile:
+    """
+    P² quantile estimator (Jain & Chlamtac): five markers, no samples kept.
+    """
+
+    def __init__(self, p):
+        self.p = p
+        self.q = []                     # marker heights
+        self.n = [0, 1, 2, 3, 4]        # marker positions
+        self.np = [0, 2 * p, 4 * p, 2 + 2 * p, 4]   # desired positions
+        self.dn = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def push(self, x):
+        q = self.q
+        if len(q) < 5:
+            q.append(x)
+            q.sort()
+            return
+
+        # cell containing x, extending the extremes
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            self.n[i] += 1
+        for i in range(5):
+            self.np[i] += self.dn[i]
+
+        # adjust the three middle markers
+        for i in (1, 2, 3):
+            d = self.np[i] - self.n[i]
+            if ((d >= 1 and self.n[i + 1] - self.n[i] > 1)
+                    or (d <= -1 and self.n[i - 1] - self.n[i] < -1)):
+                d = 1 if d > 0 else -1
+                h = self._parabolic(i, d)
+                if not q[i - 1] < h < q[i + 1]:
+                    h = self._linear(i, d)
+                q[i] = h
+                self.n[i] += d
+
+    def _parabolic(self, i, d):
+        q, n = self.q, self.n
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def _linear(self, i, d):
+        q, n = self.q, self.n
+        return q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+
+    @property
+    def value(self):
+        q = self.q
+        if len(q) < 5:
+            if not q:
+                return 0.0
+            return q[min(int(self.p * len(q)), len(q) - 1)]
+        return q[2]
+
+
+class Metric:
+    """
+    One tracked quantity: rolling window + EWMA (+ optional quantiles).
+    """
+
+    def __init__(self, window=100, halflife=1000, quantiles=()):
+        self.window = RollingWindow(window)
+        self.ewma = EWMA(halflife)
+        self.quantiles = {p: P2Quantile(p) for p in quantiles}
+        self.count = 0
+
+    def push(self, x):
+        self.count += 1
+        self.window.push(x)
+        self.ewma.push(x)
+        for est in self.quantiles.values():
+            est.push(x)
+
+    def q(self, p):
+        return self.quantiles[p].value
+
+
+# ---------- training stats ----------
+
+class TrainingStats:
+    """
+    Convergence statistics shared by the headless loop and the GUI HUD.
+      win       1 / 0 per episode
+      reward    episode reward
+      steps     episode length
+      loss_step step at which a lost episode ended
+      td        |TD error| per Q update
+    """
+
+    def __init__(self, window=100, halflife=1000, quantiles=(0.5, 0.9, 0.99)):
+        self.win = Metric(window, halflife)
+        self.reward = Metric(window, halflife, quantiles)
+        self.steps = Metric(window, halflife, quantiles)
+        self.loss_step = Metric(window, halflife, quantiles)
+        self.td = Metric(window * 10, halflife * 10, quantiles)
+
+        self.episodes = 0
+        self.wins = 0
+
+    def update(self, td_error):
+        self.td.push(abs(td_error))
+
+    def end_episode(self, win, reward, steps):
+        self.episodes += 1
+        self.wins += 1 if win else 0
+        self.win.push(1.0 if win else 0.0)
+        self.reward.push(reward)
+        self.steps.push(steps)
+        if not win:
+            self.loss_step.push(steps)
+
+    @property
+    def overall_win_rate(self):
+        return self.wins / self.episodes if self.episodes else 0.0
+
+    def summary(self):
+        return (
+            f"win={self.win.window.mean:.2f} (ewma {self.win.ewma.mean:.2f}) | "
+            f"R={self.reward.window.mean:+.2f} | "
+            f"len={self.steps.window.mean:.1f} | "
+            f"loss@ p50={self.loss_step.q(0.5):.1f} p90={self.loss_step.q(0.9):.1f} | "
+            f"|td| p50={self.td.q(0.5):.3f} p90={self.td.q(0.9):.3f}"
+        )
@@ -2,8 +2,10 @@
 import pygame, os, time, random
 from pathlib import Path
 from .config import *
-from .env import MinesweeperEnv
+from .env import make_env
 from .agent import QAgent
+from .recorder import EpisodeLog
+from .stats import TrainingStats
 from .utils import load_image, generate_placeholder_assets
 
 ASSET_DIR = os.path.join(os.path.dirname(__file__), "..", "assets")
@@ -11,14 +13,22 @@ NUM_DIR = os.path.join(ASSET_DIR, "numbers")
 
 
 class MinesweeperUI:
-    def __init__(self):
+    def __init__(self, replay_path=None):
         pygame.init()
         self.cell = CELL_PIX
 
+        # viewport (whole board unless it is bigger than VIEW_ROWS x VIEW_COLS)
+        self.screen_rows = min(ROWS, VIEW_ROWS)
+        self.screen_cols = min(COLS, VIEW_COLS)
+        self.view_rows = self.screen_rows
+        self.view_cols = self.screen_cols
+        self.view_r = 0
+        self.view_c = 0
+
         # screen with HUD space
         self.screen = pygame.display.set_mode(
-            (COLS * self.cell + MARGIN * 2,
-             ROWS * self.cell + MARGIN * 2 + 110)
+            (self.screen_cols * self.cell + MARGIN * 2,
+             self.screen_rows * self.cell + MARGIN * 2 + 110)
         )
         pygame.display.set_caption("Minesweeper Q-Learning (8×8)")
         self.clock = pygame.time.Clock()
@@ -42,7 +52,7 @@ class MinesweeperUI:
         self.bigfont = pygame.font.SysFont("Arial", 32, bold=True)
 
         # ---------- env + agent ----------
-        self.env = MinesweeperEnv(rows=ROWS, cols=COLS, mines=MINES)
+        self.env = make_env(rows=ROWS, cols=COLS, mines=MINES)
         self.agent = QAgent(self.env)
 
         # ---------- modes ----------
@@ -61,20 +71,31 @@ class MinesweeperUI:
         self.loss_pause = 1.6
 
         # ---------- stats ----------
-        self.win_count = 0
-        self.loss_count = 0
+        self.stats = TrainingStats(window=100)
 
         # ---------- confetti ----------
         self.particles = []
 
+        # ---------- replay ----------
+        self.replay = EpisodeLog(replay_path) if replay_path else None
+        self.replay_ep = 0
+        self.replay_step = 0
+        self.replay_speed = 5.0     # UP / DOWN → steps per second
+        self.replay_acc = 0.0
+        self.replay_jump = ""       # digits + ENTER → jump to episode
+        if self.replay is not None:
+            if not len(self.replay):
+                raise ValueError(f"empty episode log: {replay_path}")
+            self.load_replay(0)
+
     # =========================================================
     # 🎉 CONFETTI (WIN)
     # =========================================================
     def spawn_confetti(self, n=60):
         for _ in range(n):
             self.particles.append({
-                "x": random.uniform(MARGIN, MARGIN + COLS * self.cell),
-                "y": random.uniform(MARGIN - 30, MARGIN + ROWS * self.cell * 0.3),
+                "x": random.uniform(MARGIN, MARGIN + self.view_cols * self.cell),
+                "y": random.uniform(MARGIN - 30, MARGIN + self.view_rows * self.cell * 0.3),
                 "vx": random.uniform(-1.5, 1.5),
                 "vy": random.uniform(1.0, 3.0),
                 "size": random.randint(3, 6),
@@ -93,48 +114,65 @@ class MinesweeperUI:
             p["y"] += p["vy"]
             p["vy"] += 0.08
 
+    # =========================================================
+    # 🔭 VIEWPORT
+    # =========================================================
+    def pan(self, dr, dc):
+        self.view_r = max(0, min(self.view_r + dr, self.env.rows - self.view_rows))
+        self.view_c = max(0, min(self.view_c + dc, self.env.cols - self.view_cols))
+
+    def follow(self, i):
+        """
+        Recenter the viewport if cell i is outside it.
+        """
+        r, c = self.env.i_to_rc(i)
+        if not (self.view_r <= r < self.view_r + self.view_rows
+                and self.view_c <= c < self.view_c + self.view_cols):
+            self.view_r, self.view_c = 0, 0
+            self.pan(r - self.view_rows // 2, c - self.view_cols // 2)
+
+    def visible_cells(self):
+        for vr in range(self.view_rows):
+            for vc in range(self.view_cols):
+                i = self.env.rc_to_i(self.view_r + vr, self.view_c + vc)
+                yield i, MARGIN + vc * self.cell, MARGIN + vr * self.cell
+
     # =========================================================
     # 🎨 DRAW
     # =========================================================
     def draw(self):
         self.screen.fill((32, 32, 32))
-        obs = self.env.observe()
 
-        # ---------- board ----------
-        for r in range(ROWS):
-            for c in range(COLS):
-                i = self.env.rc_to_i(r, c)
-                x = MARGIN + c * self.cell
-                y = MARGIN + r * self.cell
-                rect = pygame.Rect(x, y, self.cell, self.cell)
-
-                if obs["opened"][i]:
-                    self.screen.blit(self.img_open, (x, y))
-                    if obs["adj"][i] > 0:
-                        img = self.img_nums.get(obs["adj"][i])
-                        if img:
-                            self.screen.blit(img, (x, y))
-                else:
-                    self.screen.blit(self.img_tile, (x, y))
+        # ---------- board (visible cells only) ----------
+        for i, x, y in self.visible_cells():
+            rect = pygame.Rect(x, y, self.cell, self.cell)
+
+            if self.env.opened[i]:
+                self.screen.blit(self.img_open, (x, y))
+                adj = self.env.adj[i]
+                if adj > 0:
+                    img = self.img_nums.get(adj)
+                    if img:
+                        self.screen.blit(img, (x, y))
+            else:
+                self.screen.blit(self.img_tile, (x, y))
 
-                if self.last_selected == i:
-                    pygame.draw.rect(self.screen, (220, 60, 60), rect, 3)
+            if self.last_selected == i:
+                pygame.draw.rect(self.screen, (220, 60, 60), rect, 3)
 
         # ---------- overlays (WIN / BOOM) ----------
         now = time.time()
         if self.show_end_until > now:
-            overlay = pygame.Surface((COLS * self.cell, ROWS * self.cell), pygame.SRCALPHA)
+            overlay = pygame.Surface(
+                (self.view_cols * self.cell, self.view_rows * self.cell), pygame.SRCALPHA
+            )
             overlay.fill((0, 0, 0, 130))
             self.screen.blit(overlay, (MARGIN, MARGIN))
 
             if self.end_state == "loss":
-                for i in range(self.env.n):
+                for i, x, y in self.visible_cells():
                     if self.env.mine[i]:
-                        r, c = self.env.i_to_rc(i)
-                        self.screen.blit(
-                            self.img_bomb,
-                            (MARGIN + c * self.cell, MARGIN + r * self.cell)
-                        )
+                        self.screen.blit(self.img_bomb, (x, y))
                 msg = "BOOOOM! :("
                 col = (255, 120, 120)
             else:
@@ -154,24 +192,48 @@ class MinesweeperUI:
             )
 
         # ---------- HUD ----------
-        hud_y = MARGIN + ROWS * self.cell + 8
-        hud = pygame.Surface((self.screen.get_width(), 60), pygame.SRCALPHA)
+        hud_y = MARGIN + self.screen_rows * self.cell + 8
+        hud = pygame.Surface((self.screen.get_width(), 84), pygame.SRCALPHA)
         hud.fill((15, 15, 15, 230))
         self.screen.blit(hud, (0, hud_y))
 
         # left HUD (modes)
-        left = (
-            f"A = {'AUTO' if self.auto else 'MANUAL'}   | "
-            f"SPACE = {'TRAIN' if self.train else 'EVAL'}   | "
-            f"G = {'GREEDY' if self.greedy else 'EPS-GREEDY'}"
-        )
+        if self.replay is not None:
+            left = (
+                f"REPLAY {self.replay_ep + 1}/{len(self.replay)}   | "
+                f"step {self.replay_step}/{len(self.replay_data['actions'])}   | "
+                f"{self.replay_speed:g} steps/s"
+            )
+            help_ = (
+                "LEFT/RIGHT = +-1   PGUP/PGDN = +-100   HOME/END   "
+                "UP/DOWN = speed   digits+ENTER = jump"
+                + (f"   [{self.replay_jump}]" if self.replay_jump else "")
+            )
+            self.screen.blit(self.font.render(help_, True, (170, 170, 170)), (MARGIN, hud_y + 30))
+        else:
+            left = (
+                f"A = {'AUTO' if self.auto else 'MANUAL'}   | "
+                f"SPACE = {'TRAIN' if self.train else 'EVAL'}   | "
+                f"G = {'GREEDY' if self.greedy else 'EPS-GREEDY'}"
+            )
         self.screen.blit(self.font.render(left, True, (230, 230, 230)), (MARGIN, hud_y + 6))
 
         # right HUD (stats)
-        right = f"Wins: {self.win_count}   Losses: {self.loss_count}"
+        st = self.stats
+        right = f"Wins: {st.wins}   Losses: {st.episodes - st.wins}"
         txt = self.font.render(right, True, (230, 230, 230))
         self.screen.blit(txt, (self.screen.get_width() - txt.get_width() - 20, hud_y + 6))
 
+        # bottom HUD (rolling stats, last 100 episodes)
+        bottom = (
+            f"win%={st.win.window.mean:.2f}   "
+            f"R={st.reward.window.mean:+.2f}   "
+            f"len={st.steps.window.mean:.1f}   "
+            f"loss@ p50={st.loss_step.q(0.5):.0f}   "
+            f"|td| p90={st.td.q(0.9):.3f}"
+        )
+        self.screen.blit(self.font.render(bottom, True, (170, 200, 170)), (MARGIN, hud_y + 54))
+
         pygame.display.flip()
 
     # =========================================================
@@ -185,24 +247,96 @@ class MinesweeperUI:
 
         action = self.agent.select(obs, legal, greedy=self.greedy)
         self.last_selected = action
+        self.follow(action)
 
         reward, done, _ = self.env.open_cell(action)
         self.episode_reward += reward
 
         if self.train:
-            self.agent.update(obs, action, reward, self.env.observe(), done)
+            self.stats.update(
+                self.agent.update(obs, action, reward, self.env.observe(), done)
+            )
 
         if done:
             self.agent.save()
-            if self.env.win:
-                self.win_count += 1
-                self.end_state = "win"
-                self.spawn_confetti()
-                self.show_end_until = time.time() + self.win_pause
-            else:
-                self.loss_count += 1
-                self.end_state = "loss"
-                self.show_end_until = time.time() + self.loss_pause
+            self.end_episode(self.env.win)
+
+    def end_episode(self, win):
+        # replayed episodes are not training results (and re-seeks repeat them)
+        if self.replay is None:
+            self.stats.end_episode(win, self.episode_reward, self.env.steps)
+        if win:
+            self.end_state = "win"
+            self.spawn_confetti()
+            self.show_end_until = time.time() + self.win_pause
+        else:
+            self.end_state = "loss"
+            self.show_end_until = time.time() + self.loss_pause
+
+    # =========================================================
+    # ⏪ REPLAY (recorded episodes, no agent / no RNG)
+    # =========================================================
+    def load_replay(self, i):
+        i = max(0, min(i, len(self.replay) - 1))
+        ep = self.replay[i]
+
+        # episodes keep their own board size; the viewport shows any size
+        self.env = make_env(
+            rows=ep["rows"], cols=ep["cols"], mines=len(ep["mines"])
+        )
+        self.env.load_layout(ep["mines"])
+        self.view_rows = min(ep["rows"], self.screen_rows)
+        self.view_cols = min(ep["cols"], self.screen_cols)
+        self.view_r = self.view_c = 0
+
+        self.replay_ep = i
+        self.replay_data = ep
+        self.replay_step = 0
+        self.replay_acc = 0.0
+        self.episode_reward = 0.0
+        self.last_selected = None
+        self.show_end_until = 0
+        self.particles.clear()
+
+    def step_replay(self):
+        actions = self.replay_data["actions"]
+        if self.replay_step >= len(actions):
+            return
+
+        action = actions[self.replay_step]
+        self.env.open_cell(action)
+        self.episode_reward += self.replay_data["rewards"][self.replay_step]
+        self.last_selected = action
+        self.follow(action)
+        self.replay_step += 1
+
+        if self.replay_step == len(actions):
+            self.end_episode(self.replay_data["win"])
+
+    def handle_replay_key(self, key):
+        if key == pygame.K_RIGHT:
+            self.load_replay(self.replay_ep + 1)
+        elif key == pygame.K_LEFT:
+            self.load_replay(self.replay_ep - 1)
+        elif key == pygame.K_PAGEDOWN:
+            self.load_replay(self.replay_ep + 100)
+        elif key == pygame.K_PAGEUP:
+            self.load_replay(self.replay_ep - 100)
+        elif key == pygame.K_HOME:
+            self.load_replay(0)
+        elif key == pygame.K_END:
+            self.load_replay(len(self.replay) - 1)
+        elif key == pygame.K_UP:
+            self.replay_speed = min(self.replay_speed * 2, 960.0)
+        elif key == pygame.K_DOWN:
+            self.replay_speed = max(self.replay_speed / 2, 0.25)
+        elif pygame.K_0 <= key <= pygame.K_9:
+            self.replay_jump += chr(key)
+        elif key == pygame.K_BACKSPACE:
+            self.replay_jump = self.replay_jump[:-1]
+        elif key in (pygame.K_RETURN, pygame.K_KP_ENTER) and self.replay_jump:
+            self.load_replay(int(self.replay_jump) - 1)
+            self.replay_jump = ""
 
     # =========================================================
     # 🎮 MAIN LOOP
@@ -217,6 +351,9 @@ class MinesweeperUI:
                 if ev.type == pygame.QUIT:
                     running = False
 
+                elif ev.type == pygame.KEYDOWN and self.replay is not None:
+                    self.handle_replay_key(ev.key)
+
                 elif ev.type == pygame.KEYDOWN:
                     if ev.key == pygame.K_a:       # A = AUTO / MANUAL
                         self.auto = not self.auto
@@ -224,27 +361,28 @@ class MinesweeperUI:
                         self.train = not self.train
                     elif ev.key == pygame.K_g:     # G = GREEDY
                         self.greedy = not self.greedy
+                    elif ev.key == pygame.K_UP:    # arrows = pan (big boards)
+                        self.pan(-1, 0)
+                    elif ev.key == pygame.K_DOWN:
+                        self.pan(1, 0)
+                    elif ev.key == pygame.K_LEFT:
+                        self.pan(0, -1)
+                    elif ev.key == pygame.K_RIGHT:
+                        self.pan(0, 1)
 
                 # MANUAL PLAY (mouse click)
-                elif ev.type == pygame.MOUSEBUTTONDOWN and not self.auto:
+                elif (ev.type == pygame.MOUSEBUTTONDOWN and not self.auto
+                      and self.replay is None):
                     mx, my = pygame.mouse.get_pos()
-                    if my < MARGIN + ROWS * self.cell:
+                    if my < MARGIN + self.view_rows * self.cell:
                         c = (mx - MARGIN) // self.cell
                         r = (my - MARGIN) // self.cell
-                        if 0 <= r < ROWS and 0 <= c < COLS:
-                            idx = self.env.rc_to_i(r, c)
+                        if 0 <= r < self.view_rows and 0 <= c < self.view_cols:
+                            idx = self.env.rc_to_i(self.view_r + r, self.view_c + c)
                             reward, done, _ = self.env.open_cell(idx)
                             self.episode_reward += reward
                             if done:
-                                if self.env.win:
-                                    self.win_count += 1
-                                    self.end_state = "win"
-                                    self.spawn_confetti()
-                                    self.show_end_until = time.time() + self.win_pause
-                                else:
-                                    self.loss_count += 1
-                                    self.end_state = "loss"
-                                    self.show_end_until = time.time() + self.loss_pause
+                                self.end_episode(self.env.win)
 
             # pause screen on win/loss
             if self.show_end_until > now:
@@ -252,14 +390,24 @@ class MinesweeperUI:
                 self.clock.tick(30)
                 continue
             elif self.show_end_until and self.show_end_until <= now:
-                self.show_end_until = 0
-                self.particles.clear()
-                self.last_selected = None
-                self.env.reset()
-                self.episode_reward = 0.0
+                if self.replay is not None:
+                    self.load_replay(self.replay_ep + 1)
+                else:
+                    self.show_end_until = 0
+                    self.particles.clear()
+                    self.last_selected = None
+                    self.env.reset()
+                    self.episode_reward = 0.0
+
+            # REPLAY mode
+            if self.replay is not None:
+                self.replay_acc += self.replay_speed / 30
+                while self.replay_acc >= 1 and not self.show_end_until:
+                    self.step_replay()
+                    self.replay_acc -= 1
 
             # AUTO mode
-            if self.auto:
+            elif self.auto:
                 if tick % 6 == 0:
                     self.step_agent()
                 tick += 1